@@ -0,0 +1,318 @@
+# benchmarks/load_test.py
+import sys
+import os
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+import urllib.request
+from typing import List, Dict, Any, Optional
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "ui", "app.py"))
+
+FIRST_NAMES = ["Ali", "Sara", "Omar", "Ayesha", "Bilal", "Fatima", "Hassan", "Zainab", "Usman", "Maryam"]
+LAST_NAMES = ["Khan", "Ahmed", "Malik", "Hussain", "Raza", "Iqbal", "Shah", "Qureshi"]
+GRADES = ["9", "10", "11", "12"]
+
+# script_finished statuses that end a rerun (FINISHED_EARLY_FOR_RERUN means st.rerun() follows)
+FINISHED = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+            ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY}
+LOGIN_PAGE = "Login (submit)"   # includes the app's fixed 1s pause, so reported on its own
+
+def synthetic_roster(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """n random students; the first three use the demo login ids S001-S003."""
+    rng = random.Random(seed)
+    return [{
+        "id": f"S{i + 1:03d}",
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "age": rng.randint(13, 18),
+        "grade": rng.choice(GRADES),
+        "gpa": round(rng.uniform(50, 100), 1),
+        "notes": "",
+    } for i in range(n)]
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Current resident set size of a process, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+class Server:
+    """One headless `streamlit run ui/app.py` on localhost, serving every simulated session."""
+
+    def __init__(self, workdir: str, timeout: float = 60.0):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.log_path = os.path.join(workdir, "server.log")
+        self.log = open(self.log_path, "w")
+        # the app opens data/*.json relative to its working directory
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH,
+             "--server.headless", "true",
+             "--server.address", "127.0.0.1",
+             "--server.port", str(self.port),
+             "--server.fileWatcherType", "none",
+             "--server.enableXsrfProtection", "false",
+             "--browser.gatherUsageStats", "false"],
+            cwd=workdir, stdout=self.log, stderr=subprocess.STDOUT)
+        deadline = time.time() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    break
+            except OSError:
+                if self.proc.poll() is not None or time.time() > deadline:
+                    self.stop()
+                    with open(self.log_path) as f:
+                        raise RuntimeError(f"streamlit server did not start:\n{f.read()}")
+                time.sleep(0.2)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def rss_mb(self) -> Optional[float]:
+        return rss_mb(self.proc.pid)
+
+    def stop(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self.log.close()
+
+class Client:
+    """One browser session talking Streamlit's websocket protocol.
+
+    Like the frontend, it keeps the values of widgets it has set and resends
+    them on every rerun; button clicks are one-shot triggers.
+    """
+
+    def __init__(self, url: str, timeout: float, record):
+        self.url = url
+        self.timeout = timeout
+        self.record = record
+        self.ws = None
+        self.widgets: Dict[tuple, Any] = {}    # (element type, label) -> widget proto from the last rerun
+        self.alerts: List[str] = []              # st.success/error/... texts from the last rerun
+        self.values: Dict[str, WidgetState] = {}
+        self.failed_checks: List[str] = []
+
+    async def connect(self) -> None:
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self) -> None:
+        await self.ws.close()
+
+    def expect(self, ok: bool, what: str) -> None:
+        """Note a flow step that finished without an exception but did not do its job."""
+        if not ok:
+            self.failed_checks.append(what)
+
+    def widget(self, kind: str, label: str):
+        return self.widgets[(kind, label)]
+
+    def set(self, kind: str, label: str, **value) -> None:
+        w = self.widget(kind, label)
+        self.values[w.id] = WidgetState(id=w.id, **value)
+
+    async def rerun(self, page: str, trigger: Optional[str] = None) -> None:
+        """Send one rerun (optionally clicking the button labelled trigger) and time it."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        if trigger:
+            msg.rerun_script.widget_states.widgets.append(
+                WidgetState(id=self.widget("button", trigger).id, trigger_value=True))
+        start = time.perf_counter()
+        try:
+            failed = await asyncio.wait_for(self._read_until_finished(msg), self.timeout)
+        except asyncio.TimeoutError:
+            failed = True
+        self.record(page, time.perf_counter() - start, failed)
+
+    async def _read_until_finished(self, msg: BackMsg) -> bool:
+        await self.ws.send(msg.SerializeToString())
+        widgets = {}
+        alerts = []
+        failed = False
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                etype = element.WhichOneof("type")
+                if etype == "exception":
+                    failed = True
+                elif etype == "alert":
+                    alerts.append(element.alert.body)
+                proto = getattr(element, etype)
+                if hasattr(proto, "id") and hasattr(proto, "label"):
+                    widgets[(etype, proto.label)] = proto
+            elif kind == "script_finished" and fwd.script_finished in FINISHED:
+                self.widgets = widgets
+                self.alerts = alerts
+                return failed or fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR
+
+    async def goto(self, page: str, button: str) -> None:
+        await self.rerun(page, trigger=button)
+
+    async def login(self, username: str, password: str) -> None:
+        await self.rerun("Home")
+        await self.goto("Login", "🔐 Login")
+        self.set("text_input", "👤 Username", string_value=username)
+        self.set("text_input", "🔒 Password", string_value=password)
+        await self.rerun(LOGIN_PAGE, trigger="Login")
+        self.expect(("button", "🚪 Logout") in self.widgets, f"login as {username}")
+        # the browser only sends form fields together with their submit
+        self.values.clear()
+
+async def student_flow(client: Client, rng: random.Random) -> None:
+    await client.goto("Home", "🏠 Home")
+    await client.goto("Profile", "👤 Profile")
+    await client.goto("Timetable", "📅 Timetable")
+
+async def admin_flow(client: Client, rng: random.Random) -> None:
+    await client.goto("Home", "🏠 Home")
+    await client.goto("AllStudents", "👥 All Students")
+    client.set("text_input", "Search students", string_value=rng.choice(LAST_NAMES))
+    await client.rerun("AllStudents (search)")
+    client.set("text_input", "Filter by grade", string_value=rng.choice(GRADES))
+    await client.rerun("AllStudents (filter)")
+    client.values.clear()
+    select = client.widget("selectbox", "Choose student to edit")
+    client.set("selectbox", "Choose student to edit", string_value=rng.choice(select.options[1:]))
+    await client.rerun("AllStudents (select)")
+    client.set("number_input", "GPA / Score", double_value=round(rng.uniform(50, 100), 1))
+    await client.rerun("AllStudents (edit)", trigger="💾 Update Student")
+    client.expect(any("Successfully updated" in a for a in client.alerts), "update student")
+    client.values.clear()
+
+def percentile(sorted_data: List[float], q: float) -> float:
+    if len(sorted_data) == 1:
+        return sorted_data[0]
+    return statistics.quantiles(sorted_data, n=100, method="inclusive")[int(q) - 1]
+
+async def run_sessions(server: Server, sessions: int, iterations: int, admin_ratio: float,
+                       timeout: float, seed: int) -> Dict[str, Any]:
+    """Run `sessions` concurrent clients against the server and collect per-page latencies."""
+    latencies: Dict[str, List[float]] = {}
+    errors = 0
+
+    def record(page: str, seconds: float, failed: bool) -> None:
+        nonlocal errors
+        latencies.setdefault(page, []).append(seconds)
+        errors += failed
+
+    n_admins = round(sessions * admin_ratio)
+    clients = [Client(server.url, timeout, record) for _ in range(sessions)]
+    rngs = [random.Random(seed * 1000 + i) for i in range(sessions)]
+    await asyncio.gather(*(c.connect() for c in clients))
+    # everyone logs in first; the login pause is not part of the timed phase
+    await asyncio.gather(*(
+        c.login("admin", "admin123") if i < n_admins else c.login(f"s00{i % 3 + 1}", f"s00{i % 3 + 1}")
+        for i, c in enumerate(clients)))
+    login = latencies.pop(LOGIN_PAGE, [])
+    latencies.clear()
+
+    async def loop(i: int, client: Client) -> None:
+        flow = admin_flow if i < n_admins else student_flow
+        for _ in range(iterations):
+            await flow(client, rngs[i])
+
+    rss_before = server.rss_mb()
+    start = time.perf_counter()
+    await asyncio.gather(*(loop(i, c) for i, c in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    rss_after = server.rss_mb()
+    await asyncio.gather(*(c.close() for c in clients))
+
+    failed_checks = [what for c in clients for what in c.failed_checks]
+    reruns = sum(len(v) for v in latencies.values())
+    return {
+        "sessions": sessions,
+        "reruns": reruns,
+        "errors": errors,
+        "failed_checks": failed_checks,
+        "elapsed": elapsed,
+        "throughput": reruns / elapsed if elapsed else 0.0,
+        "rss_before_mb": rss_before,
+        "rss_after_mb": rss_after,
+        "login": sorted(login),
+        "pages": {page: sorted(v) for page, v in latencies.items()},
+    }
+
+def run_load(roster_size: int, session_counts: List[int], iterations: int, admin_ratio: float,
+             timeout: float, seed: int) -> List[Dict[str, Any]]:
+    """Start one server on a fresh synthetic roster and run each session count against it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "data"))
+        with open(os.path.join(tmp, "data", "students.json"), "w", encoding="utf-8") as f:
+            json.dump(synthetic_roster(roster_size, seed), f)
+        server = Server(tmp, timeout)
+        try:
+            results = []
+            for sessions in session_counts:
+                result = asyncio.run(run_sessions(server, sessions, iterations, admin_ratio, timeout, seed))
+                result["roster"] = roster_size
+                results.append(result)
+            return results
+        finally:
+            server.stop()
+
+def _row(label: str, data: List[float]) -> str:
+    return (f"{label:<24} {len(data):>5} {percentile(data, 50) * 1000:>9.1f} {percentile(data, 90) * 1000:>9.1f} "
+            f"{percentile(data, 99) * 1000:>9.1f} {data[-1] * 1000:>9.1f}")
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"\n== roster={result['roster']} concurrent sessions={result['sessions']} (one shared server) ==")
+    print(f"reruns={result['reruns']} errors={result['errors']} elapsed={result['elapsed']:.1f}s "
+          f"throughput={result['throughput']:.1f} reruns/s")
+    if result["failed_checks"]:
+        print(f"failed checks: {len(result['failed_checks'])} ({', '.join(sorted(set(result['failed_checks'])))})")
+    if result["rss_before_mb"] is not None:
+        print(f"server RSS: {result['rss_before_mb']:.1f} -> {result['rss_after_mb']:.1f} MB "
+              f"(growth {result['rss_after_mb'] - result['rss_before_mb']:+.1f} MB)")
+    print(f"{'page':<24} {'n':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for page, data in sorted(result["pages"].items()):
+        print(_row(page, data))
+    if result["login"]:
+        print("not in totals (includes the app's 1s pause after login):")
+        print(_row(LOGIN_PAGE, result["login"]))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive concurrent admin/student sessions against one local "
+                                                 "`streamlit run ui/app.py` server over its websocket protocol.")
+    parser.add_argument("--roster", type=int, nargs="+", default=[100, 1000, 5000], help="synthetic roster sizes")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="flows per session")
+    parser.add_argument("--admin-ratio", type=float, default=0.25, help="share of sessions that are admins")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for roster in args.roster:
+        for result in run_load(roster, args.sessions, args.iterations, args.admin_ratio, args.timeout, args.seed):
+            print_report(result)
+
+if __name__ == "__main__":
+    main()
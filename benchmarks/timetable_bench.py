@@ -0,0 +1,45 @@
+# benchmarks/timetable_bench.py
+import sys
+import os
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import tempfile
+import time
+from services.timetable import TimetableManager
+
+def check_clashes(store: TimetableManager) -> int:
+    """Count slots where a teacher or room is booked twice."""
+    seen = set()
+    clashes = 0
+    for week in store.schedules.values():
+        for slot, lesson in enumerate(week):
+            if not lesson:
+                continue
+            for key in (("teacher", lesson.teacher, slot), ("room", lesson.room, slot)):
+                if key in seen:
+                    clashes += 1
+                seen.add(key)
+    return clashes
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time whole-school timetable generation.")
+    parser.add_argument("--grades", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TimetableManager(os.path.join(tmp, "timetables.json"))
+        print(f"{'grades':>8} {'best (s)':>10} {'per grade (ms)':>15} {'clashes':>8}")
+        for n in args.grades:
+            grades = [f"Grade {i + 1}" for i in range(n)]
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                store.generate(grades, keep_existing=False)
+                best = min(best, time.perf_counter() - start)
+            print(f"{n:>8} {best:>10.3f} {best / n * 1000:>15.2f} {check_clashes(store):>8}")
+
+if __name__ == "__main__":
+    main()
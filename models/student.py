@@ -3,6 +3,10 @@ from dataclasses import dataclass, asdict
 from typing import Dict, Any
 import re
 
+def grade_key(grade: str) -> str:
+    """Normalized grade used to group students, e.g. "10 " and "10" are the same grade."""
+    return grade.strip().lower()
+
 @dataclass
 class Student:
     id: str            # unique id (string)
@@ -0,0 +1,38 @@
+# models/timetable.py
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, List
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+PERIODS = ["9:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-1:00", "1:00-2:00", "2:00-3:00"]
+LUNCH_PERIOD = 3   # index into PERIODS, same for every grade
+
+@dataclass
+class Course:
+    subject: str
+    periods: int                 # lessons per week for each grade
+    teachers: List[str] = field(default_factory=list)
+    rooms: List[str] = field(default_factory=list)
+
+    def validate(self) -> None:
+        """Raise ValueError if any field is invalid."""
+        if not self.subject or not isinstance(self.subject, str):
+            raise ValueError("subject must be a non-empty string.")
+        if not isinstance(self.periods, int) or self.periods < 1:
+            raise ValueError("periods must be a positive integer.")
+        if not self.teachers:
+            raise ValueError(f"{self.subject} needs at least one teacher.")
+        if not self.rooms:
+            raise ValueError(f"{self.subject} needs at least one room.")
+
+@dataclass
+class Lesson:
+    subject: str
+    teacher: str
+    room: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "Lesson":
+        return Lesson(**d)
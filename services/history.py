@@ -0,0 +1,149 @@
+# services/history.py
+import json
+from array import array
+from bisect import bisect_right
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple, Iterable
+
+def current_term(today: Optional[date] = None) -> int:
+    """Term key as an int, e.g. 20262 for the second term of 2026 (three terms a year)."""
+    today = today or date.today()
+    return today.year * 10 + (today.month - 1) // 4 + 1
+
+def _to_hundredths(gpa: float) -> int:
+    return int(round(float(gpa) * 100))
+
+CHECKPOINT_EVERY = 32
+
+class _Series:
+    """Append-only GPA/grade history of one student.
+
+    Terms are kept absolute (sorted, so they can be bisected); GPAs are
+    delta-encoded in hundredths against the previous entry. Every
+    CHECKPOINT_EVERY entries the absolute value is kept as well, so decoding
+    any single entry costs at most CHECKPOINT_EVERY steps.
+    """
+    __slots__ = ("terms", "deltas", "grades", "checkpoints", "last")
+
+    def __init__(self):
+        self.terms = array("l")
+        self.deltas = array("l")
+        self.grades = array("H")        # index into GpaHistory._grades
+        self.checkpoints = array("l")   # absolute value of entry i * CHECKPOINT_EVERY
+        self.last = 0
+
+    def append(self, term: int, gpa: int, grade: int) -> None:
+        if self.terms and term < self.terms[-1]:
+            raise ValueError("history entries must be recorded in term order.")
+        if len(self.terms) % CHECKPOINT_EVERY == 0:
+            self.checkpoints.append(gpa)
+        self.deltas.append(gpa - self.last if self.terms else gpa)
+        self.terms.append(term)
+        self.grades.append(grade)
+        self.last = gpa
+
+    def value_at(self, index: int) -> int:
+        start = index - index % CHECKPOINT_EVERY
+        value = self.checkpoints[index // CHECKPOINT_EVERY]
+        for i in range(start + 1, index + 1):
+            value += self.deltas[i]
+        return value
+
+    def index_at(self, term: int) -> int:
+        """Index of the last entry recorded at or before term, or -1."""
+        return bisect_right(self.terms, term) - 1
+
+class GpaHistory:
+    """Per-student GPA time series backed by an append-only JSON-lines log."""
+
+    def __init__(self, filepath: str = "data/gpa_history.jsonl"):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._series: Dict[str, _Series] = {}
+        self._grades: List[str] = []
+        self._grade_codes: Dict[str, int] = {}
+        if self.filepath.exists():
+            self._load()
+
+    def _grade_code(self, grade: str) -> int:
+        code = self._grade_codes.get(grade)
+        if code is None:
+            code = len(self._grades)
+            self._grades.append(grade)
+            self._grade_codes[grade] = code
+        return code
+
+    def _load(self) -> None:
+        with self.filepath.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    e = json.loads(line)
+                    self._append(e["id"], int(e["term"]), float(e["gpa"]), e["grade"])
+
+    def _append(self, student_id: str, term: int, gpa: float, grade: str) -> None:
+        series = self._series.get(student_id)
+        if series is None:
+            series = self._series[student_id] = _Series()
+        series.append(term, _to_hundredths(gpa), self._grade_code(grade))
+
+    def record(self, student_id: str, gpa: float, grade: str, term: Optional[int] = None) -> None:
+        """Append a GPA/grade change, skipping it when nothing actually changed."""
+        term = current_term() if term is None else term
+        series = self._series.get(student_id)
+        if series is not None and series.terms:
+            if series.last == _to_hundredths(gpa) and self._grades[series.grades[-1]] == grade:
+                return
+        self._append(student_id, term, gpa, grade)
+        with self.filepath.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": student_id, "term": term, "gpa": float(gpa), "grade": grade},
+                               ensure_ascii=False) + "\n")
+
+    def has(self, student_id: str) -> bool:
+        return student_id in self._series
+
+    def last_terms(self, student_id: str, n: int) -> List[Tuple[int, float]]:
+        """(term, gpa) for the student's last n terms, oldest first; the last change in a term wins."""
+        series = self._series.get(student_id)
+        if series is None or n <= 0:
+            return []
+        out: List[Tuple[int, float]] = []
+        value = series.last
+        for i in range(len(series.terms) - 1, -1, -1):
+            term = series.terms[i]
+            if not out or out[-1][0] != term:
+                if len(out) == n:
+                    break
+                out.append((term, value / 100))
+            value -= series.deltas[i]
+        out.reverse()
+        return out
+
+    def gpa_at(self, student_id: str, term: int) -> Optional[float]:
+        """GPA in effect at the end of term, or None if nothing was recorded yet."""
+        series = self._series.get(student_id)
+        if series is None:
+            return None
+        i = series.index_at(term)
+        return series.value_at(i) / 100 if i >= 0 else None
+
+    def cohort_average(self, term: int, grade: Optional[str] = None,
+                       student_ids: Optional[Iterable[str]] = None) -> Optional[float]:
+        """Average GPA in effect at term across students (optionally of one grade).
+
+        Each student costs one bisect plus a bounded decode from the nearest checkpoint.
+        """
+        ids = self._series.keys() if student_ids is None else student_ids
+        total, count = 0, 0
+        for sid in ids:
+            series = self._series.get(sid)
+            if series is None:
+                continue
+            i = series.index_at(term)
+            if i < 0:
+                continue
+            if grade is not None and self._grades[series.grades[i]] != grade:
+                continue
+            total += series.value_at(i)
+            count += 1
+        return total / count / 100 if count else None
@@ -1,17 +1,43 @@
 # services/manager.py
 import json
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import fields, replace
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from models.student import Student
+from typing import List, Optional, Dict, Any, Tuple
+from models.student import Student, grade_key
+from services.history import GpaHistory
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class StudentManager:
-    def __init__(self, filepath: str = "data/students.json"):
+    def __init__(self, filepath: str = "data/students.json", cache_size: int = 128):
         self.filepath = Path(filepath)
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
         if not self.filepath.exists():
             self._write_json([])
+        # the app shares one manager between sessions (threads); guards mutations and the caches
+        self._lock = threading.RLock()
         self.students: List[Student] = self._load_all()
+        self._by_id: Dict[str, Student] = {}
+        # per-grade leaderboards: sorted (-gpa, id) entries, best first
+        self._rankings: Dict[str, List[Tuple[float, str]]] = {}
+        for s in self.students:
+            self._index(s)
+        self.history = GpaHistory(str(self.filepath.with_name("gpa_history.jsonl")))
+        # seed the history with the current roster the first time it is opened
+        for s in self.students:
+            if not self.history.has(s.id):
+                self._record_history(s)
+        # query results keyed by (data version, normalized query), least recently used first
+        self.version = 0
+        self.cache_size = cache_size
+        self._query_cache: "OrderedDict[Tuple, Tuple[Student, ...]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _read_json(self) -> List[Dict[str, Any]]:
         with self.filepath.open("r", encoding="utf-8") as f:
@@ -28,10 +54,36 @@ class StudentManager:
     def save(self) -> None:
         data = [s.to_dict() for s in self.students]
         self._write_json(data)
+        # every mutation goes through save(), so cached query results are stale now
+        self.version += 1
+        self._query_cache.clear()
 
     def list_students(self) -> List[Student]:
         return list(self.students)
 
+    # Leaderboard index
+    def _index(self, s: Student) -> None:
+        self._by_id[s.id] = s
+        insort(self._rankings.setdefault(grade_key(s.grade), []), (-s.gpa, s.id))
+
+    def _unindex(self, student_id: str, grade: str, gpa: float) -> None:
+        self._by_id.pop(student_id, None)
+        ranking = self._rankings.get(grade_key(grade))
+        if not ranking:
+            return
+        i = bisect_left(ranking, (-gpa, student_id))
+        if i < len(ranking) and ranking[i] == (-gpa, student_id):
+            del ranking[i]
+        if not ranking:
+            del self._rankings[grade_key(grade)]
+
+    def _record_history(self, s: Student) -> None:
+        # the student is already saved at this point; a history failure must not report it as failed
+        try:
+            self.history.record(s.id, s.gpa, s.grade)
+        except (ValueError, OSError):
+            logger.exception("Could not record GPA history for student %s", s.id)
+
     def _generate_id(self) -> str:
         return str(uuid.uuid4())[:8]
 
@@ -41,41 +93,55 @@ class StudentManager:
             student_data["id"] = self._generate_id()
         student = Student.from_dict(student_data)
         student.validate()
-        # check unique id
-        if any(s.id == student.id for s in self.students):
-            raise ValueError("Student with this id already exists.")
-        self.students.append(student)
-        self.save()
+        with self._lock:
+            # check unique id
+            if student.id in self._by_id:
+                raise ValueError("Student with this id already exists.")
+            self.students.append(student)
+            self._index(student)
+            self.save()
+            self._record_history(student)
         return student
 
     def find_by_id(self, student_id: str) -> Optional[Student]:
-        for s in self.students:
-            if s.id == student_id:
-                return s
-        return None
+        return self._by_id.get(student_id)
 
     def update_student(self, student_id: str, updates: Dict[str, Any]) -> Student:
-        s = self.find_by_id(student_id)
-        if not s:
-            raise ValueError("Student not found.")
-        # apply updates
-        for k, v in updates.items():
-            if k == "age":
-                v = int(v)
-            if k == "gpa":
-                v = float(v)
-            if hasattr(s, k):
-                setattr(s, k, v)
-        s.validate()
-        self.save()
-        return s
+        with self._lock:
+            s = self.find_by_id(student_id)
+            if not s:
+                raise ValueError("Student not found.")
+            # apply updates to a copy so a failed validation leaves the stored record untouched
+            names = {f.name for f in fields(Student)}
+            changes = {}
+            for k, v in updates.items():
+                if k == "age":
+                    v = int(v)
+                if k == "gpa":
+                    v = float(v)
+                if k in names:
+                    changes[k] = v
+            updated = replace(s, **changes)
+            updated.validate()
+            if updated.id != s.id and updated.id in self._by_id:
+                raise ValueError("Student with this id already exists.")
+            self._unindex(s.id, s.grade, s.gpa)
+            self.students = [updated if x is s else x for x in self.students]
+            self._index(updated)
+            self.save()
+            self._record_history(updated)
+        return updated
 
     def delete_student(self, student_id: str) -> bool:
-        before = len(self.students)
-        self.students = [s for s in self.students if s.id != student_id]
-        changed = len(self.students) != before
-        if changed:
-            self.save()
+        with self._lock:
+            s = self.find_by_id(student_id)
+            if s:
+                self._unindex(s.id, s.grade, s.gpa)
+            before = len(self.students)
+            self.students = [s for s in self.students if s.id != student_id]
+            changed = len(self.students) != before
+            if changed:
+                self.save()
         return changed
 
     # Search & filter
@@ -91,7 +157,10 @@ class StudentManager:
 
     def filter(self, min_age: Optional[int]=None, max_age: Optional[int]=None,
                min_gpa: Optional[float]=None, max_gpa: Optional[float]=None, grade: Optional[str]=None) -> List[Student]:
-        res = self.students
+        return self._apply_filter(self.students, min_age, max_age, min_gpa, max_gpa, grade)
+
+    def _apply_filter(self, res: List[Student], min_age: Optional[int], max_age: Optional[int],
+                      min_gpa: Optional[float], max_gpa: Optional[float], grade: Optional[str]) -> List[Student]:
         if min_age is not None:
             res = [s for s in res if s.age >= min_age]
         if max_age is not None:
@@ -104,3 +173,42 @@ class StudentManager:
             g = grade.strip().lower()
             res = [s for s in res if s.grade.strip().lower() == g]
         return res
+
+    # Cached search + filter
+    def query(self, text: str = "", min_age: Optional[int]=None, max_age: Optional[int]=None,
+              min_gpa: Optional[float]=None, max_gpa: Optional[float]=None, grade: Optional[str]=None) -> List[Student]:
+        """Search by text and then filter, reusing the result of an identical earlier query."""
+        with self._lock:
+            key = (self.version, text.strip().lower(), min_age, max_age, min_gpa, max_gpa,
+                   grade.strip().lower() if grade and grade.strip() else None)
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                self.cache_hits += 1
+                return list(cached)
+            self.cache_misses += 1
+            res = self._apply_filter(self.search(text), min_age, max_age, min_gpa, max_gpa, grade)
+            self._query_cache[key] = tuple(res)
+            if len(self._query_cache) > self.cache_size:
+                self._query_cache.popitem(last=False)
+            return res
+
+    def cache_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.cache_hits, "misses": self.cache_misses,
+                    "size": len(self._query_cache), "version": self.version}
+
+    # Leaderboards
+    def top_k(self, grade: str, k: int = 10) -> List[Student]:
+        """The k students with the highest GPA in grade, best first."""
+        with self._lock:
+            ranking = self._rankings.get(grade_key(grade), [])
+            return [self._by_id[sid] for _, sid in ranking[:max(k, 0)]]
+
+    def rank(self, student_id: str) -> Optional[int]:
+        """1-based GPA rank of the student within their grade; ties share a rank."""
+        with self._lock:
+            s = self.find_by_id(student_id)
+            if not s:
+                return None
+            return bisect_left(self._rankings[grade_key(s.grade)], (-s.gpa,)) + 1
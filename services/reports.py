@@ -0,0 +1,175 @@
+# services/reports.py
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import plotly.express as px
+from plotly.subplots import make_subplots
+from models.student import Student
+from services.manager import StudentManager
+
+FORMATS = ("html", "png")
+
+def gpa_status(gpa: float) -> str:
+    """Performance band shown on the dashboard, profile and report cards."""
+    if gpa >= 90:
+        return "Excellent"
+    if gpa >= 75:
+        return "Good"
+    return "Needs Improvement"
+
+def gpa_comparison_chart(student: Student, class_average: float):
+    """Bar chart of the student's GPA against the class average."""
+    fig = px.bar(
+        x=["Your GPA", "Class Average"],
+        y=[student.gpa, class_average],
+        title="Your GPA vs Class Average",
+        color=["Your GPA", "Class Average"],
+        color_discrete_map={"Your GPA": "#4b4bff", "Class Average": "#ff6b6b"}
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+def grade_averages(students: Iterable[Student]) -> Dict[str, float]:
+    """Average GPA per grade, computed once and shared by every report card."""
+    totals: Dict[str, Tuple[float, int]] = {}
+    for s in students:
+        total, count = totals.get(s.grade, (0.0, 0))
+        totals[s.grade] = (total + s.gpa, count + 1)
+    return {g: total / count for g, (total, count) in totals.items()}
+
+def report_path(out_dir: Path, student_id: str, fmt: str) -> Path:
+    return out_dir / f"{student_id}.{fmt}"
+
+def render_report_html(student: Student, class_average: float) -> str:
+    fig = gpa_comparison_chart(student, class_average)
+    chart = fig.to_html(full_html=False, include_plotlyjs="cdn")
+    notes = student.notes if student.notes else "No notes available"
+    return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Report Card - {escape(student.name)}</title></head>
+<body style="font-family: Arial, sans-serif;">
+    <h1 style="color: #4b4bff;">🎓 {escape(student.name)}</h1>
+    <p><strong>Student ID:</strong> {escape(student.id)} | <strong>Grade:</strong> {escape(student.grade)}</p>
+    <p><strong>Age:</strong> {student.age} | <strong>GPA:</strong> {student.gpa} | <strong>Status:</strong> {gpa_status(student.gpa)}</p>
+    <p><strong>Grade Average:</strong> {class_average:.1f}</p>
+    <p><strong>Notes:</strong> {escape(notes)}</p>
+    {chart}
+</body>
+</html>
+"""
+
+def report_card_figure(student: Student, class_average: float):
+    """The whole report card as one figure (profile table + GPA chart), used for PNG export."""
+    notes = student.notes if student.notes else "No notes available"
+    fields = [
+        ("Student ID", student.id), ("Grade", student.grade), ("Age", student.age),
+        ("GPA", student.gpa), ("Status", gpa_status(student.gpa)),
+        ("Grade Average", f"{class_average:.1f}"), ("Notes", notes),
+    ]
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.45, 0.55],
+                        specs=[[{"type": "table"}, {"type": "xy"}]],
+                        subplot_titles=("Profile", "Your GPA vs Class Average"))
+    fig.add_table(
+        header=dict(values=["Field", "Value"], fill_color="#4b4bff", font=dict(color="white")),
+        cells=dict(values=[[f for f, _ in fields], [str(v) for _, v in fields]], align="left"),
+        row=1, col=1
+    )
+    for trace in gpa_comparison_chart(student, class_average).data:
+        fig.add_trace(trace, row=1, col=2)
+    fig.update_layout(title=f"🎓 Report Card - {student.name}", title_font_color="#4b4bff",
+                      showlegend=False, width=1100, height=500)
+    return fig
+
+def check_png_export() -> None:
+    """Raise ValueError unless plotly can export PNG here (needs kaleido and Chrome)."""
+    try:
+        px.bar(x=["a"], y=[1]).to_image(format="png")
+    except Exception as e:
+        raise ValueError(f"PNG export is unavailable ({e.__class__.__name__}: {e}); "
+                         "install kaleido and Chrome, or use fmt='html'.") from e
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # write to a temp file first so an interrupted run never leaves a half-written card behind
+    tmp = path.with_name(path.name + ".part")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _render_chunk(chunk: List[Dict[str, Any]], averages: Dict[str, float], out_dir: str, fmt: str) -> List[str]:
+    """Worker entry point: render one chunk of students and return the ids written."""
+    out = Path(out_dir)
+    written = []
+    for d in chunk:
+        student = Student.from_dict(d)
+        class_average = averages.get(student.grade, student.gpa)
+        if fmt == "html":
+            data = render_report_html(student, class_average).encode("utf-8")
+        else:
+            # PNG export needs the optional kaleido package
+            data = report_card_figure(student, class_average).to_image(format="png")
+        _write_atomic(report_path(out, student.id, fmt), data)
+        written.append(student.id)
+    return written
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def generate_reports(manager: StudentManager, out_dir: str = "reports", fmt: str = "html",
+                     workers: Optional[int] = None, chunk_size: int = 25, resume: bool = True) -> List[str]:
+    """Render a report card for every student into out_dir using a process pool.
+
+    With resume=True students whose card already exists are skipped, so an
+    interrupted run can simply be started again. Returns the ids rendered.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {', '.join(FORMATS)}.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    students = manager.list_students()
+    averages = grade_averages(students)
+    pending = [s.to_dict() for s in students
+               if not (resume and report_path(out, s.id, fmt).exists())]
+    if not pending:
+        return []
+    if fmt == "png":
+        # fail once here rather than in every worker after the pool has started
+        check_png_export()
+
+    chunks = _chunks(pending, chunk_size)
+    written: List[str] = []
+    if workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            written.extend(_render_chunk(chunk, averages, str(out), fmt))
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_chunk, chunk, averages, str(out), fmt) for chunk in chunks]
+        for future in futures:
+            written.extend(future.result())
+    return written
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate report cards for every student.")
+    parser.add_argument("--data", default="data/students.json", help="path to students.json")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", choices=FORMATS, default="html")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=25)
+    parser.add_argument("--no-resume", action="store_true", help="re-render cards that already exist")
+    args = parser.parse_args(argv)
+
+    manager = StudentManager(args.data)
+    try:
+        written = generate_reports(manager, args.out, fmt=args.format, workers=args.workers,
+                                   chunk_size=args.chunk_size, resume=not args.no_resume)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote {len(written)} report card(s) to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# services/timetable.py
+import json
+import math
+import random
+import threading
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable
+from models.student import grade_key
+from models.timetable import Course, Lesson, DAYS, PERIODS, LUNCH_PERIOD
+
+# A week is a bitset: slot = day * len(PERIODS) + period.
+SLOTS = len(DAYS) * len(PERIODS)
+DAY_MASKS = [sum(1 << (d * len(PERIODS) + p) for p in range(len(PERIODS)) if p != LUNCH_PERIOD)
+             for d in range(len(DAYS))]
+TEACHING_MASK = sum(DAY_MASKS)
+TEACHING_SLOTS = bin(TEACHING_MASK).count("1")
+
+# subject -> (lessons per week, room kind); general subjects share classrooms
+CURRICULUM = [
+    ("Mathematics", 5, "Room"),
+    ("Science", 5, "Lab"),
+    ("English", 5, "Room"),
+    ("History", 2, "Room"),
+    ("Art", 2, "Art Studio"),
+    ("PE", 2, "Gym"),
+    ("Music", 1, "Music Room"),
+    ("Geography", 1, "Room"),
+    ("Drama", 1, "Drama Hall"),
+    ("Club Activities", 1, "Room"),
+]
+
+def default_courses(n_grades: int, slack: float = 1.2) -> List[Course]:
+    """The standard curriculum with teacher and room pools sized for n_grades.
+
+    Pools get `slack` times the strictly needed capacity plus one, since a
+    school booked to the last period cannot be timetabled without clashes.
+    """
+    n_grades = max(n_grades, 1)
+    room_load: Dict[str, int] = {}
+    for _, periods, kind in CURRICULUM:
+        room_load[kind] = room_load.get(kind, 0) + periods
+    rooms = {kind: [f"{kind} {i + 1}" for i in range(math.ceil(n_grades * load * slack / TEACHING_SLOTS) + 1)]
+             for kind, load in room_load.items()}
+    courses = []
+    for subject, periods, kind in CURRICULUM:
+        n_teachers = math.ceil(n_grades * periods * slack / TEACHING_SLOTS) + 1
+        teachers = [f"{subject} Teacher {i + 1}" for i in range(n_teachers)]
+        courses.append(Course(subject, periods, teachers, rooms[kind]))
+    return courses
+
+def _day_mask(slots: int) -> int:
+    """All teaching slots of every day that has at least one bit set in slots."""
+    return sum(m for m in DAY_MASKS if slots & m)
+
+def _bits(mask: int) -> List[int]:
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+class TimetableManager:
+    """Per-grade weekly schedules persisted next to students.json.
+
+    Grades are keyed by grade_key(), like the leaderboards, so "10" and "10 "
+    share one timetable.
+    """
+
+    def __init__(self, filepath: str = "data/timetables.json"):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        if not self.filepath.exists():
+            self._write_json({})
+        self.schedules: Dict[str, List[Optional[Lesson]]] = self._load_all()
+        self._tables: Dict[str, Dict[str, List[str]]] = {}
+        self.version = 0   # bumped on every regeneration, for caches built on top of table()
+        # the app shares one manager between sessions (threads)
+        self._lock = threading.RLock()
+
+    def _read_json(self) -> Dict[str, Any]:
+        with self.filepath.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, data: Dict[str, Any]) -> None:
+        with self.filepath.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def _load_all(self) -> Dict[str, List[Optional[Lesson]]]:
+        schedules = {}
+        for grade, days in self._read_json().items():
+            week: List[Optional[Lesson]] = [None] * SLOTS
+            for d, periods in enumerate(days):
+                for p, lesson in enumerate(periods):
+                    if lesson:
+                        week[d * len(PERIODS) + p] = Lesson.from_dict(lesson)
+            schedules[grade] = week
+        return schedules
+
+    def save(self) -> None:
+        data = {}
+        for grade, week in self.schedules.items():
+            data[grade] = [[week[d * len(PERIODS) + p].to_dict() if week[d * len(PERIODS) + p] else None
+                            for p in range(len(PERIODS))] for d in range(len(DAYS))]
+        self._write_json(data)
+
+    def grades(self) -> List[str]:
+        return sorted(self.schedules)
+
+    def get(self, grade: str) -> Optional[List[Optional[Lesson]]]:
+        return self.schedules.get(grade_key(grade))
+
+    def generate(self, grades: Iterable[str], courses: Optional[List[Course]] = None,
+                 keep_existing: bool = True, seed: int = 0) -> None:
+        """(Re)build the schedules of grades without teacher or room clashes.
+
+        With keep_existing=True the schedules of other grades stay as they are
+        and their teachers/rooms count as busy; otherwise the whole school is
+        rebuilt and only the given grades are kept.
+        """
+        with self._lock:
+            self._generate([grade_key(g) for g in grades], courses, keep_existing, seed)
+
+    def ensure(self, grade: str) -> None:
+        """Generate grade's schedule around the existing ones unless it already has one."""
+        grade = grade_key(grade)
+        with self._lock:
+            if grade not in self.schedules:
+                self._generate([grade], None, True, 0)
+
+    def _generate(self, grades: List[str], courses: Optional[List[Course]],
+                  keep_existing: bool, seed: int) -> None:
+        grades = list(dict.fromkeys(grades))
+        kept = [g for g in self.schedules if keep_existing and g not in grades]
+        if courses is None:
+            courses = default_courses(len(grades) + len(kept))
+        for c in courses:
+            c.validate()
+        if sum(c.periods for c in courses) > TEACHING_SLOTS:
+            raise ValueError(f"Courses need more than the {TEACHING_SLOTS} teaching periods in a week.")
+
+        teacher_busy: Dict[str, int] = {}
+        room_busy: Dict[str, int] = {}
+        schedules = {g: self.schedules[g] for g in kept}
+        for week in schedules.values():
+            for slot, lesson in enumerate(week):
+                if lesson:
+                    teacher_busy[lesson.teacher] = teacher_busy.get(lesson.teacher, 0) | (1 << slot)
+                    room_busy[lesson.room] = room_busy.get(lesson.room, 0) | (1 << slot)
+
+        rng = random.Random(seed)
+        for grade in grades:
+            for attempt in range(20):
+                week = self._place_grade(courses, teacher_busy, room_busy, rng if attempt else None)
+                if week is not None:
+                    break
+            else:
+                raise ValueError(f"Could not build a clash-free timetable for grade {grade}; "
+                                 "add more teachers or rooms.")
+            schedules[grade] = week
+
+        self.schedules = schedules
+        self._tables.clear()
+        self.version += 1
+        self.save()
+
+    def _place_grade(self, courses: List[Course], teacher_busy: Dict[str, int], room_busy: Dict[str, int],
+                     rng: Optional[random.Random]) -> Optional[List[Optional[Lesson]]]:
+        """Fill one grade's week, most constrained subject first.
+
+        Busy masks are only updated if the whole grade fits. A slot is usable
+        when the grade, one of the course's teachers and one of its rooms are
+        all free there, which is a handful of ANDs/ORs over int bitsets.
+        """
+        t_busy = dict(teacher_busy)
+        r_busy = dict(room_busy)
+        week: List[Optional[Lesson]] = [None] * SLOTS
+        grade_free = TEACHING_MASK
+        remaining = {i: c.periods for i, c in enumerate(courses)}
+        placed = {i: 0 for i in remaining}           # slots already used by each course
+        usual = {}                                   # course -> teacher who already teaches it to this grade
+
+        while remaining:
+            best, best_mask, best_count = -1, 0, SLOTS + 1
+            for i in remaining:
+                c = courses[i]
+                t_free = 0
+                for t in c.teachers:
+                    t_free |= ~t_busy.get(t, 0)
+                r_free = 0
+                for r in c.rooms:
+                    r_free |= ~r_busy.get(r, 0)
+                mask = grade_free & t_free & r_free
+                count = bin(mask).count("1")
+                if count < best_count:
+                    best, best_mask, best_count = i, mask, count
+            if not best_mask:
+                return None
+
+            # spread a subject over different days where possible
+            spread = best_mask & ~_day_mask(placed[best])
+            candidates = spread or best_mask
+            if rng is None:
+                slot = (candidates & -candidates).bit_length() - 1
+            else:
+                slot = rng.choice(_bits(candidates))
+            bit = 1 << slot
+
+            c = courses[best]
+            teachers = [t for t in c.teachers if not t_busy.get(t, 0) & bit]
+            teacher = usual[best] if usual.get(best) in teachers else min(
+                teachers, key=lambda t: bin(t_busy.get(t, 0)).count("1"))
+            room = next(r for r in c.rooms if not r_busy.get(r, 0) & bit)
+            usual.setdefault(best, teacher)
+
+            week[slot] = Lesson(c.subject, teacher, room)
+            t_busy[teacher] = t_busy.get(teacher, 0) | bit
+            r_busy[room] = r_busy.get(room, 0) | bit
+            grade_free &= ~bit
+            placed[best] |= bit
+            remaining[best] -= 1
+            if not remaining[best]:
+                del remaining[best]
+
+        teacher_busy.update(t_busy)
+        room_busy.update(r_busy)
+        return week
+
+    def table(self, grade: str) -> Optional[Dict[str, List[str]]]:
+        """Columns (Time + one per day) ready for a DataFrame, cached per grade."""
+        with self._lock:
+            return self._table(grade_key(grade))
+
+    def _table(self, grade: str) -> Optional[Dict[str, List[str]]]:
+        if grade in self._tables:
+            return self._tables[grade]
+        week = self.schedules.get(grade)
+        if week is None:
+            return None
+        table = {"Time": list(PERIODS)}
+        for d, day in enumerate(DAYS):
+            column = []
+            for p in range(len(PERIODS)):
+                lesson = week[d * len(PERIODS) + p]
+                if p == LUNCH_PERIOD:
+                    column.append("Lunch")
+                elif lesson:
+                    column.append(f"{lesson.subject} ({lesson.teacher}, {lesson.room})")
+                else:
+                    column.append("Free")
+            table[day] = column
+        self._tables[grade] = table
+        return table
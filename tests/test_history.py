@@ -0,0 +1,62 @@
+# tests/test_history.py
+import random
+from services.history import GpaHistory, CHECKPOINT_EVERY
+
+def _reference(events, student_id, term):
+    """Last (gpa, grade) recorded for student_id at or before term, by brute force."""
+    found = None
+    for sid, t, gpa, grade in events:
+        if sid == student_id and t <= term:
+            found = (gpa, grade)
+    return found
+
+def test_last_terms_keeps_last_change_per_term(tmp_path):
+    h = GpaHistory(str(tmp_path / "h.jsonl"))
+    h.record("a", 80, "10", term=20251)
+    h.record("a", 82.5, "10", term=20251)
+    h.record("a", 85, "11", term=20252)
+    h.record("a", 90, "11", term=20261)
+    assert h.last_terms("a", 2) == [(20252, 85.0), (20261, 90.0)]
+    assert h.last_terms("a", 10) == [(20251, 82.5), (20252, 85.0), (20261, 90.0)]
+    assert h.last_terms("missing", 3) == []
+
+def test_unchanged_record_is_skipped(tmp_path):
+    h = GpaHistory(str(tmp_path / "h.jsonl"))
+    h.record("a", 80, "10", term=20251)
+    h.record("a", 80, "10", term=20252)
+    assert h.last_terms("a", 5) == [(20251, 80.0)]
+    assert len((tmp_path / "h.jsonl").read_text().splitlines()) == 1
+
+def test_decode_matches_reference_across_checkpoints(tmp_path):
+    rng = random.Random(1)
+    h = GpaHistory(str(tmp_path / "h.jsonl"))
+    events = []
+    term = 20201
+    for _ in range(CHECKPOINT_EVERY * 4 + 5):
+        term += rng.choice([0, 1, 1, 2])
+        sid = rng.choice(["a", "b", "c"])
+        gpa = round(rng.uniform(40, 100), 2)
+        grade = rng.choice(["10", "11"])
+        h.record(sid, gpa, grade, term=term)
+        events.append((sid, term, gpa, grade))
+
+    reloaded = GpaHistory(str(tmp_path / "h.jsonl"))
+    for store in (h, reloaded):
+        for t in range(20200, term + 2):
+            for sid in ("a", "b", "c"):
+                ref = _reference(events, sid, t)
+                assert store.gpa_at(sid, t) == (ref[0] if ref else None)
+            for grade in (None, "10", "11"):
+                refs = [_reference(events, sid, t) for sid in ("a", "b", "c")]
+                vals = [r[0] for r in refs if r and (grade is None or r[1] == grade)]
+                expected = sum(round(v * 100) for v in vals) / len(vals) / 100 if vals else None
+                assert store.cohort_average(t, grade=grade) == expected
+
+def test_cohort_average_limited_to_student_ids(tmp_path):
+    h = GpaHistory(str(tmp_path / "h.jsonl"))
+    h.record("a", 80, "10", term=20251)
+    h.record("b", 60, "10", term=20251)
+    h.record("c", 100, "10", term=20252)
+    assert h.cohort_average(20251) == 70.0
+    assert h.cohort_average(20252, student_ids=["a", "c"]) == 90.0
+    assert h.cohort_average(20241) is None
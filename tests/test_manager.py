@@ -0,0 +1,145 @@
+# tests/test_manager.py
+import json
+import pytest
+from services.manager import StudentManager
+
+def make_manager(tmp_path, students=(), **kwargs):
+    path = tmp_path / "students.json"
+    path.write_text(json.dumps([
+        {"id": sid, "name": name, "age": 15, "grade": grade, "gpa": gpa, "notes": ""}
+        for sid, name, grade, gpa in students
+    ]))
+    return StudentManager(str(path), **kwargs)
+
+ROSTER = [
+    ("a1", "Ali Khan", "10", 80.0),
+    ("a2", "Sara Malik", "10", 92.0),
+    ("a3", "Omar Shah", "11", 70.0),
+]
+
+def test_query_counts_hits_and_misses(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    assert [s.id for s in m.query("khan")] == ["a1"]
+    assert [s.id for s in m.query("  KHAN ")] == ["a1"]
+    assert [s.id for s in m.query(grade="10", min_gpa=85)] == ["a2"]
+    assert m.cache_stats() == {"hits": 1, "misses": 2, "size": 2, "version": 0}
+
+def test_query_combines_search_and_filter(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    assert [s.id for s in m.query("a", grade="11")] == ["a3"]
+
+def test_query_cache_evicts_least_recently_used(tmp_path):
+    m = make_manager(tmp_path, ROSTER, cache_size=2)
+    m.query("ali")
+    m.query("sara")
+    m.query("ali")      # refresh "ali"
+    m.query("omar")     # evicts "sara"
+    m.query("ali")
+    m.query("sara")
+    stats = m.cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["size"] == 2
+
+@pytest.mark.parametrize("mutate", [
+    lambda m: m.add_student({"id": "a4", "name": "Khan Jr", "age": 14, "grade": "10", "gpa": 60}),
+    lambda m: m.update_student("a2", {"name": "Sara Khan"}),
+    lambda m: m.delete_student("a1"),
+])
+def test_mutations_invalidate_query_cache(tmp_path, mutate):
+    m = make_manager(tmp_path, ROSTER)
+    before = [s.id for s in m.query("khan")]
+    mutate(m)
+    assert m.cache_stats()["size"] == 0
+    after = [s.id for s in m.query("khan")]
+    assert after != before
+    assert m.cache_stats()["misses"] == 2
+
+def test_failed_update_leaves_record_and_cache_untouched(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    cached = m.query("ali")
+    with pytest.raises(ValueError):
+        m.update_student("a1", {"name": "A", "gpa": 10})
+    s = m.find_by_id("a1")
+    assert (s.name, s.gpa) == ("Ali Khan", 80.0)
+    assert m.query("ali") == cached
+    assert m.cache_stats()["version"] == 0
+    # an unrelated later save must not persist the rejected values
+    m.add_student({"id": "a4", "name": "Bilal Raza", "age": 14, "grade": "10", "gpa": 60})
+    saved = {d["id"]: d for d in json.loads((tmp_path / "students.json").read_text())}
+    assert (saved["a1"]["name"], saved["a1"]["gpa"]) == ("Ali Khan", 80.0)
+
+def test_top_k_and_rank_with_ties(tmp_path):
+    m = make_manager(tmp_path, [
+        ("b1", "Ali Khan", "10", 80.0),
+        ("b2", "Sara Malik", "10", 92.0),
+        ("b3", "Omar Shah", "10", 80.0),
+        ("b4", "Zainab Raza", " 10 ", 70.0),
+        ("b5", "Usman Iqbal", "11", 99.0),
+    ])
+    assert [s.id for s in m.top_k("10", 3)] == ["b2", "b1", "b3"]
+    assert [m.rank(sid) for sid in ("b2", "b1", "b3", "b4", "b5")] == [1, 2, 2, 4, 1]
+    assert m.top_k("12") == []
+    assert m.top_k("10", 0) == []
+    assert m.rank("missing") is None
+
+def test_leaderboard_follows_add_update_delete(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    m.add_student({"id": "a4", "name": "Bilal Raza", "age": 14, "grade": "10", "gpa": 95})
+    assert [s.id for s in m.top_k("10")] == ["a4", "a2", "a1"]
+
+    m.update_student("a1", {"gpa": 99})
+    assert [s.id for s in m.top_k("10")] == ["a1", "a4", "a2"]
+    assert m.rank("a1") == 1
+
+    m.update_student("a2", {"grade": "11"})
+    assert [s.id for s in m.top_k("10")] == ["a1", "a4"]
+    assert [s.id for s in m.top_k("11")] == ["a2", "a3"]
+    assert m.rank("a3") == 2
+
+    m.delete_student("a1")
+    assert [s.id for s in m.top_k("10")] == ["a4"]
+    assert m.rank("a4") == 1
+    assert m.rank("a1") is None
+
+def test_failed_update_does_not_touch_leaderboard(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    with pytest.raises(ValueError):
+        m.update_student("a1", {"gpa": 500})
+    assert [s.id for s in m.top_k("10")] == ["a2", "a1"]
+    assert m.top_k("10")[1].gpa == 80.0
+    assert m.rank("a1") == 2
+
+def test_add_student_rejects_duplicate_id(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    with pytest.raises(ValueError):
+        m.add_student({"id": "a1", "name": "Copy Cat", "age": 14, "grade": "10", "gpa": 60})
+    assert len(m.list_students()) == 3
+
+def test_gpa_and_grade_updates_are_recorded_in_history(tmp_path):
+    m = make_manager(tmp_path, ROSTER)
+    log = tmp_path / "gpa_history.jsonl"
+    seeded = len(log.read_text().splitlines())
+    assert seeded == len(ROSTER)
+
+    m.update_student("a1", {"name": "Ali Raza"})
+    assert len(log.read_text().splitlines()) == seeded
+
+    m.update_student("a1", {"gpa": 88})
+    m.update_student("a1", {"grade": "11"})
+    entries = [json.loads(line) for line in log.read_text().splitlines()[seeded:]]
+    assert [(e["id"], e["gpa"], e["grade"]) for e in entries] == [("a1", 88.0, "10"), ("a1", 88.0, "11")]
+    assert m.history.last_terms("a1", 1)[0][1] == 88.0
+
+    m.add_student({"id": "a4", "name": "Bilal Raza", "age": 14, "grade": "10", "gpa": 60})
+    assert m.history.has("a4")
+
+def test_history_failure_does_not_fail_saved_update(tmp_path, monkeypatch):
+    m = make_manager(tmp_path, ROSTER)
+    def broken(*args, **kwargs):
+        raise ValueError("history entries must be recorded in term order.")
+    monkeypatch.setattr(m.history, "record", broken)
+    updated = m.update_student("a1", {"gpa": 88})
+    assert updated.gpa == 88.0
+    saved = {d["id"]: d for d in json.loads((tmp_path / "students.json").read_text())}
+    assert saved["a1"]["gpa"] == 88.0
@@ -0,0 +1,81 @@
+# tests/test_reports.py
+import json
+import pytest
+import plotly.graph_objects as go
+from models.student import Student
+from services.manager import StudentManager
+from services.reports import generate_reports, grade_averages, report_card_figure, report_path
+
+ROSTER = [
+    ("r1", "Ali <b>Khan</b> & Co", "10", 95.0),
+    ("r2", "Sara Malik", "10", 80.0),
+    ("r3", "Omar Shah", "11", 60.0),
+    ("r4", "Zainab Raza", "11", 75.0),
+    ("r5", "Usman Iqbal", "12", 89.9),
+]
+
+def make_manager(tmp_path):
+    path = tmp_path / "students.json"
+    path.write_text(json.dumps([
+        {"id": sid, "name": name, "age": 15, "grade": grade, "gpa": gpa, "notes": ""}
+        for sid, name, grade, gpa in ROSTER
+    ]))
+    return StudentManager(str(path))
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 25), (2, 2)])
+def test_writes_one_card_per_student(tmp_path, workers, chunk_size):
+    m = make_manager(tmp_path)
+    out = tmp_path / "out"
+    written = generate_reports(m, str(out), workers=workers, chunk_size=chunk_size)
+    assert sorted(written) == [sid for sid, *_ in ROSTER]
+    assert sorted(p.name for p in out.iterdir()) == [f"{sid}.html" for sid, *_ in ROSTER]
+    card = report_path(out, "r1", "html").read_text(encoding="utf-8")
+    assert "Ali &lt;b&gt;Khan&lt;/b&gt; &amp; Co" in card
+    assert "<b>Khan</b>" not in card
+    assert "Excellent" in card
+    assert "Needs Improvement" in report_path(out, "r3", "html").read_text(encoding="utf-8")
+    assert "Good" in report_path(out, "r4", "html").read_text(encoding="utf-8")
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 25), (2, 2)])
+def test_resume_skips_and_no_resume_rerenders(tmp_path, workers, chunk_size):
+    m = make_manager(tmp_path)
+    out = tmp_path / "out"
+    generate_reports(m, str(out), workers=workers, chunk_size=chunk_size)
+    mtimes = {p.name: p.stat().st_mtime_ns for p in out.iterdir()}
+
+    assert generate_reports(m, str(out), workers=workers, chunk_size=chunk_size) == []
+    assert {p.name: p.stat().st_mtime_ns for p in out.iterdir()} == mtimes
+
+    report_path(out, "r2", "html").unlink()
+    assert generate_reports(m, str(out), workers=workers, chunk_size=chunk_size) == ["r2"]
+
+    rerendered = generate_reports(m, str(out), workers=workers, chunk_size=chunk_size, resume=False)
+    assert sorted(rerendered) == [sid for sid, *_ in ROSTER]
+
+def test_grade_averages():
+    students = [Student(sid, name, 15, grade, gpa) for sid, name, grade, gpa in ROSTER]
+    assert grade_averages(students) == {"10": 87.5, "11": 67.5, "12": 89.9}
+    assert grade_averages([]) == {}
+
+@pytest.mark.parametrize("kwargs", [{"fmt": "pdf"}, {"chunk_size": 0}])
+def test_rejects_bad_arguments(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        generate_reports(make_manager(tmp_path), str(tmp_path / "out"), **kwargs)
+
+def test_png_fails_up_front_when_export_unavailable(tmp_path, monkeypatch):
+    def no_export(self, *args, **kwargs):
+        raise RuntimeError("Chrome not found")
+    monkeypatch.setattr(go.Figure, "to_image", no_export)
+    out = tmp_path / "out"
+    with pytest.raises(ValueError, match="PNG export is unavailable"):
+        generate_reports(make_manager(tmp_path), str(out), fmt="png", workers=2, chunk_size=2)
+    assert list(out.iterdir()) == []
+
+def test_report_card_figure_table():
+    fig = report_card_figure(Student("r1", "Ann Lee", 15, "10", 92.0, ""), 80.25)
+    table = fig.data[0]
+    assert table.type == "table"
+    assert list(table.cells.values[0]) == ["Student ID", "Grade", "Age", "GPA", "Status", "Grade Average", "Notes"]
+    assert list(table.cells.values[1]) == ["r1", "10", "15", "92.0", "Excellent", "80.2", "No notes available"]
+    assert [t.type for t in fig.data[1:]] == ["bar", "bar"]
+    assert "Ann Lee" in fig.layout.title.text
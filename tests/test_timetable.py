@@ -0,0 +1,101 @@
+# tests/test_timetable.py
+import pytest
+from models.timetable import Course, DAYS, PERIODS, LUNCH_PERIOD
+from services.timetable import TimetableManager, TEACHING_SLOTS, default_courses
+
+def make_store(tmp_path):
+    return TimetableManager(str(tmp_path / "timetables.json"))
+
+def clashes(store):
+    """(kind, name, slot) bookings that appear more than once across all grades."""
+    seen, dupes = set(), []
+    for week in store.schedules.values():
+        for slot, lesson in enumerate(week):
+            if not lesson:
+                continue
+            for key in (("teacher", lesson.teacher, slot), ("room", lesson.room, slot)):
+                if key in seen:
+                    dupes.append(key)
+                seen.add(key)
+    return dupes
+
+def as_dicts(week):
+    return [lesson.to_dict() if lesson else None for lesson in week]
+
+def test_generate_many_grades_without_clashes(tmp_path):
+    store = make_store(tmp_path)
+    grades = [str(g) for g in range(60)]
+    store.generate(grades)
+    assert store.grades() == sorted(grades)
+    assert clashes(store) == []
+    for week in store.schedules.values():
+        assert sum(1 for lesson in week if lesson) == TEACHING_SLOTS
+        assert all(week[d * len(PERIODS) + LUNCH_PERIOD] is None for d in range(len(DAYS)))
+
+def test_repeated_ensure_keeps_existing_grades_and_avoids_clashes(tmp_path):
+    store = make_store(tmp_path)
+    store.generate(["9", "10", "11"])
+    before = {g: as_dicts(w) for g, w in store.schedules.items()}
+    for g in range(12, 30):
+        store.ensure(str(g))
+    store.ensure("10")
+    for g, week in before.items():
+        assert as_dicts(store.get(g)) == week
+    assert len(store.grades()) == 21
+    assert clashes(store) == []
+
+def test_grades_share_a_timetable_by_grade_key(tmp_path):
+    store = make_store(tmp_path)
+    store.ensure("10")
+    store.ensure(" 10 ")
+    store.ensure("Uni")
+    assert store.grades() == ["10", "uni"]
+    assert store.table("UNI ") == store.table("uni")
+
+def test_generate_without_keep_existing_drops_unlisted_grades(tmp_path):
+    store = make_store(tmp_path)
+    store.generate(["9", "10", "11"])
+    store.generate(["10", "12"], keep_existing=False)
+    assert store.grades() == ["10", "12"]
+    assert store.get("9") is None
+    assert clashes(store) == []
+
+def test_save_and_reload_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    store.generate(["9", "10"])
+    reloaded = make_store(tmp_path)
+    assert reloaded.grades() == store.grades()
+    for g in store.grades():
+        assert as_dicts(reloaded.get(g)) == as_dicts(store.get(g))
+        assert reloaded.table(g) == store.table(g)
+
+def test_table_layout_and_cache(tmp_path):
+    store = make_store(tmp_path)
+    store.ensure("10")
+    table = store.table("10")
+    assert table["Time"] == PERIODS
+    assert list(table) == ["Time"] + DAYS
+    for day in DAYS:
+        assert table[day][LUNCH_PERIOD] == "Lunch"
+        assert "Free" not in table[day]
+    assert store.table("10") is table
+    version = store.version
+    store.generate(["10"])
+    assert store.version == version + 1
+    assert store.table("10") is not table
+    assert store.table("missing") is None
+
+def test_rejects_courses_over_teaching_slots(tmp_path):
+    store = make_store(tmp_path)
+    with pytest.raises(ValueError):
+        store.generate(["10"], courses=[Course("Mathematics", TEACHING_SLOTS + 1, ["T1"], ["R1"])])
+    assert store.grades() == []
+
+def test_rejects_too_small_pools(tmp_path):
+    store = make_store(tmp_path)
+    store.generate(["9"])
+    with pytest.raises(ValueError, match="clash-free"):
+        store.generate([str(g) for g in range(10)], courses=default_courses(1))
+    # a failed generation keeps the previous schedules
+    assert store.grades() == ["9"]
+    assert make_store(tmp_path).grades() == ["9"]
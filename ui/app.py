@@ -5,7 +5,10 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
+from models.student import grade_key
 from services.manager import StudentManager
+from services.reports import gpa_status, gpa_comparison_chart
+from services.timetable import TimetableManager
 import pandas as pd
 from PIL import Image
 import plotly.express as px
@@ -90,7 +93,30 @@ if 'student_id' not in st.session_state:
     st.session_state.student_id = ""
 
 # --- Initialize Manager ---
-manager = StudentManager("data/students.json")
+# Kept across reruns so its query cache survives; mutations invalidate it.
+@st.cache_resource
+def get_manager():
+    return StudentManager("data/students.json")
+
+manager = get_manager()
+
+@st.cache_resource
+def get_timetables():
+    return TimetableManager("data/timetables.json")
+
+timetables = get_timetables()
+
+@st.cache_resource(max_entries=64)
+def timetable_frame(grade, version):
+    """Rendered timetable per grade; a regeneration bumps the version and misses the cache."""
+    return pd.DataFrame(timetables.table(grade))
+
+def grade_options(grades):
+    """One entry per grade_key, labelled with the first spelling seen."""
+    labels = {}
+    for g in grades:
+        labels.setdefault(grade_key(g), g.strip())
+    return labels
 
 # --- User Authentication System ---
 def hash_password(password):
@@ -294,23 +320,28 @@ def student_dashboard(student):
     
     with col4:
         # GPA status indicator
-        status = "Excellent" if student.gpa >= 90 else "Good" if student.gpa >= 75 else "Needs Improvement"
-        st.metric("📈 Status", status)
+        st.metric("📈 Status", gpa_status(student.gpa))
     
     # Progress Chart
     st.markdown("### 📊 Your Performance")
     
     # Create a simple progress chart for the student
-    fig = px.bar(
-        x=["Your GPA", "Class Average"],
-        y=[student.gpa, 75],  # Assuming class average is 75
-        title="Your GPA vs Class Average",
-        color=["Your GPA", "Class Average"],
-        color_discrete_map={"Your GPA": "#4b4bff", "Class Average": "#ff6b6b"}
-    )
-    fig.update_layout(showlegend=False)
+    fig = gpa_comparison_chart(student, 75)  # Assuming class average is 75
     st.plotly_chart(fig, use_container_width=True)
 
+    # GPA trend over the last terms
+    trend = manager.history.last_terms(student.id, 8)
+    if len(trend) > 1:
+        fig = px.line(
+            x=[str(term) for term, _ in trend],
+            y=[gpa for _, gpa in trend],
+            title="Your GPA Trend",
+            markers=True,
+            labels={"x": "Term", "y": "GPA"}
+        )
+        fig.update_traces(line_color="#4b4bff")
+        st.plotly_chart(fig, use_container_width=True)
+
 def home_page():
     # Header with Logo
     col_logo, col_title = st.columns([1, 4])
@@ -391,6 +422,20 @@ def admin_dashboard():
             excellent = sum(1 for s in students if s.gpa >= 90)
             st.metric("Excellent (90+)", excellent)
         
+        # Leaderboard
+        st.markdown("### 🏆 Leaderboard")
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            grades = grade_options(s.grade for s in students)
+            lb_grade = st.selectbox("Grade", options=sorted(grades), format_func=grades.get)
+        with col2:
+            lb_k = st.number_input("Top", min_value=1, max_value=100, value=10, step=1)
+        leaders = manager.top_k(lb_grade, int(lb_k))
+        st.dataframe(pd.DataFrame([
+            {"Rank": manager.rank(s.id), "Name": s.name, "ID": s.id, "GPA": s.gpa}
+            for s in leaders
+        ]), use_container_width=True, hide_index=True)
+
         # Recent students
         st.markdown("### 👥 Recent Students")
         recent_students = students[-5:]  # Last 5 students
@@ -444,16 +489,9 @@ def profile_page():
             
             with col2:
                 # GPA interpretation
-                if student.gpa >= 90:
-                    status = "🎉 Excellent"
-                    color = "green"
-                elif student.gpa >= 75:
-                    status = "👍 Good"
-                    color = "blue"
-                else:
-                    status = "💪 Needs Improvement"
-                    color = "orange"
-                st.metric("Performance", status)
+                status = gpa_status(student.gpa)
+                icons = {"Excellent": "🎉", "Good": "👍", "Needs Improvement": "💪"}
+                st.metric("Performance", f"{icons[status]} {status}")
             
             with col3:
                 st.metric("Grade Level", student.grade)
@@ -519,18 +557,15 @@ def all_students_page():
 
     grade_filter = st.text_input("Filter by grade", placeholder="Enter exact grade to filter...")
 
-    # Process filters
-    if search_q:
-        students = manager.search(search_q)
-    else:
-        students = manager.list_students()
-
-    students = manager.filter(
+    # Process filters (served from the manager's query cache when repeated)
+    query = dict(
+        text=search_q,
         min_age=(min_age if min_age > 0 else None),
         max_age=(max_age if max_age < 100 else None),
         min_gpa=(min_gpa if min_gpa > 0 else None),
         grade=(grade_filter if grade_filter.strip() else None)
     )
+    students = manager.query(**query)
 
     # Display Results
     st.subheader(f"📋 Student Records ({len(students)} found)")
@@ -538,8 +573,15 @@ def all_students_page():
     if not students:
         st.info("👋 No students found. Add some students to get started!")
     else:
-        df = pd.DataFrame([s.to_dict() for s in students])
-        st.dataframe(df, use_container_width=True)
+        # Rebuild the table only when the query or the data changed
+        df_key = (manager.version, tuple(sorted(query.items())))
+        if st.session_state.get("students_df_key") != df_key:
+            st.session_state.students_df = pd.DataFrame([s.to_dict() for s in students])
+            st.session_state.students_df_key = df_key
+        st.dataframe(st.session_state.students_df, use_container_width=True)
+
+    stats = manager.cache_stats()
+    st.caption(f"Query cache: {stats['hits']} hits / {stats['misses']} misses ({stats['size']} cached)")
 
     # Update / Delete Section
     st.markdown("---")
@@ -601,22 +643,36 @@ def timetable_page():
     st.markdown("---")
     
     # Personalized timetable based on grade
+    grade = None
     if st.session_state.user_role == "student":
         student = get_student_by_username(st.session_state.username)
         if student:
+            grade = student.grade
             st.info(f"📚 Your Timetable for Grade {student.grade}")
-    
-    # Sample timetable data
-    timetable_data = {
-        "Time": ["9:00-10:00", "10:00-11:00", "11:00-12:00", "12:00-1:00", "1:00-2:00", "2:00-3:00"],
-        "Monday": ["Mathematics", "Science", "English", "Lunch", "History", "Art"],
-        "Tuesday": ["English", "Mathematics", "Science", "Lunch", "PE", "Music"],
-        "Wednesday": ["Science", "English", "Mathematics", "Lunch", "Geography", "Drama"],
-        "Thursday": ["Mathematics", "Art", "Science", "Lunch", "English", "PE"],
-        "Friday": ["English", "History", "Mathematics", "Lunch", "Science", "Club Activities"]
-    }
-    
-    df_timetable = pd.DataFrame(timetable_data)
+
+    if grade is None:
+        grades = grade_options([s.grade for s in manager.list_students()] + timetables.grades())
+        if not grades:
+            st.info("👋 No grades yet. Add some students to get started!")
+            return
+        grade = st.selectbox("Grade", options=sorted(grades), format_func=grades.get)
+        if st.session_state.user_role == "admin":
+            if st.button("🔄 Regenerate All Timetables"):
+                try:
+                    timetables.generate(list(grades), keep_existing=False)
+                    st.success(f"✅ Generated timetables for {len(grades)} grade(s)")
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+
+    # Generate on first view, fitting around the grades that already have one
+    if timetables.get(grade) is None:
+        try:
+            timetables.ensure(grade)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+
+    df_timetable = timetable_frame(grade_key(grade), timetables.version)
     st.dataframe(df_timetable, use_container_width=True)
 
 # --- Main App Logic ---